@@ -20,10 +20,8 @@ data_dir = os.path.join(root_dir, "doc", "annotated_data")
 ###################################################################
 
 def boolean_data_counts(header: str, df: pd.DataFrame) -> tuple[int, int]:
-    column_data = df[header].tolist()
-    counts_yes = column_data.count("[Y]")
-    counts_no = column_data.count("[N]")
-    return counts_yes, counts_no
+    value_counts = df[header].value_counts(dropna=False)
+    return int(value_counts.get("[Y]", 0)), int(value_counts.get("[N]", 0))
 
 def paper_counts(configs: dict) -> list[str]:
     counts_dict = {
@@ -37,16 +35,24 @@ def paper_counts(configs: dict) -> list[str]:
     }
 
     for search_phase, file_name in file_dict.items():
-        df = read_csv(data_dir, file_name)
-        csv_headers = df.columns.tolist() # type: ignore
-
         # Collect paper counts for initial filtering
         init_filter_header = configs["headers"]["initial_filtering"]
         sec_filter_header = configs["headers"]["second_filtering"]
-        
+        root_paper_header = configs["headers"]["root_paper_id"]
+
+        # Only parse the columns counted below, stored as small category codes.
+        # A callable skips missing headers instead of failing inside read_csv,
+        # so they still reach the header check below
+        wanted_headers = {init_filter_header, sec_filter_header}
+        if search_phase == "snowballing":
+            wanted_headers.add(root_paper_header)
+        df = read_csv(
+            data_dir, file_name, usecols=lambda header: header in wanted_headers, dtype="category"
+        )
+        csv_headers = df.columns.tolist() # type: ignore
+
         # Count the number of root papers
         if search_phase == "snowballing":
-            root_paper_header = configs["headers"]["root_paper_id"]
             column_data = df[root_paper_header].tolist()
             counts_dict[search_phase]["num_of_roots"] = len(set(column_data))
  
@@ -21,7 +21,8 @@ from .figure_templates import(
     horizontal_boxplot,
     upset_plot,
     two_labels_venn,
-    two_dimensional_heatmap
+    two_dimensional_heatmap,
+    batch_render
 )
 
 from .table_templates import(
@@ -63,6 +64,7 @@ __all__ = [
     "upset_plot",
     "two_labels_venn",
     "two_dimensional_heatmap",
+    "batch_render",
 
     # Templates for tables
     "vertical_tables",
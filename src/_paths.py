@@ -0,0 +1,16 @@
+"""
+Docstring for src._paths
+Output directory handling shared by the figure and table templates.
+"""
+
+import os
+
+# Output directories already created in this process
+_MKDIR_CACHE = set()
+
+def _ensure_dir(path: str) -> None:
+    """Create the parent directory of `path` once per process."""
+    d = os.path.dirname(path)
+    if d and d not in _MKDIR_CACHE:     # A bare file name goes to the working directory
+        os.makedirs(d, exist_ok=True)
+        _MKDIR_CACHE.add(d)
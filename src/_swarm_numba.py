@@ -0,0 +1,102 @@
+"""
+Docstring for src._swarm_numba
+Numba kernels used by horizontal boxplots: the beeswarm point layout and
+the per-series medians of ragged data.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def swarm_layout(vals: np.ndarray, y0: float, point_size: float) -> np.ndarray:
+    """
+    Place points of a single swarm without overlap.
+
+    `vals` are the point positions along the value axis and `point_size` is
+    the marker diameter, both expressed in the same (display) units. Each
+    point is placed, in ascending order of value, at the smallest offset from
+    `y0` that does not collide with the points already placed.
+
+    Returns: the offset-axis positions, in the original order of `vals`
+    """
+    n = vals.shape[0]
+    order = np.argsort(vals)
+    xs = vals[order]
+    ys = np.zeros(n)
+    candidates = np.empty(2 * n + 1)
+    min_dist2 = point_size * point_size
+
+    for j in range(n):
+        x = xs[j]
+
+        # Placed neighbours closer than one diameter along the value axis
+        start = j
+        while start > 0 and x - xs[start - 1] < point_size:
+            start -= 1
+
+        # Candidate offsets: the centre line, or touching one of the neighbours
+        candidates[0] = 0.0
+        m = 1
+        for k in range(start, j):
+            dx = x - xs[k]
+            dy = np.sqrt(min_dist2 - dx * dx)
+            candidates[m] = ys[k] + dy
+            candidates[m + 1] = ys[k] - dy
+            m += 2
+
+        # Keep the collision-free candidate closest to the centre line
+        best = 0.0
+        best_abs = np.inf
+        for c in range(m):
+            y = candidates[c]
+            if abs(y) >= best_abs:
+                continue
+            free = True
+            for k in range(start, j):
+                dx = x - xs[k]
+                dy = y - ys[k]
+                if dx * dx + dy * dy < min_dist2 - 1e-9:
+                    free = False
+                    break
+            if free:
+                best = y
+                best_abs = abs(y)
+
+        if best_abs == np.inf:
+            # Stack on top of the neighbourhood
+            best = ys[start:j].max() + point_size
+        ys[j] = best
+
+    positions = np.empty(n)
+    for j in range(n):
+        positions[order[j]] = y0 + ys[j]
+    return positions
+
+
+@njit(cache=True)
+def grouped_medians(values: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """
+    Medians of several series stored back to back in `values`, where series
+    `i` is `values[bounds[i]:bounds[i + 1]]`. Empty series give NaN.
+    """
+    n = bounds.shape[0] - 1
+    out = np.empty(n)
+    for i in range(n):
+        seg = np.sort(values[bounds[i]:bounds[i + 1]])
+        m = seg.shape[0]
+        if m == 0:
+            out[i] = np.nan
+        elif m % 2 == 1:
+            out[i] = seg[m // 2]
+        else:
+            lo = seg[m // 2 - 1]
+            out[i] = lo + (seg[m // 2] - lo) * 0.5
+    return out
@@ -3,33 +3,99 @@ Docstring for src.figure_templates
 Templates for various types of figures used in data visualization.
 """
 
+import colorsys
 from collections import Counter
+from functools import lru_cache
 from typing import Literal
+import matplotlib
+matplotlib.use("Agg")  # Figures are only written to files; skip GUI backends
 import matplotlib.pyplot as plt
 from matplotlib import cm
 import os
 import numpy as np
-import seaborn as sns
 from matplotlib.ticker import FuncFormatter, MaxNLocator
-from upsetplot import UpSet, from_memberships
 import matplotlib.colors as mcolors
-from matplotlib_venn import venn2
-from matplotlib.transforms import Affine2D
-import pandas as pd
+from matplotlib.transforms import Affine2D, ScaledTranslation
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 
+from ._swarm_numba import grouped_medians, swarm_layout
+from ._paths import _ensure_dir
+
+# Color tables parsed once at import time
+_TABLEAU_RGBA = np.array([mcolors.to_rgba(c, alpha=0.7) for c in mcolors.TABLEAU_COLORS.values()])
+_PASTEL1_RGBA = np.array([mcolors.to_rgba(c) for c in cm.Pastel1.colors])  # type: ignore
+
+def _value_labels(values: list) -> list[str]:
+    """Annotation text for each value: two decimals for floats, plain str otherwise."""
+    return [f"{v:.2f}" if isinstance(v, float) else str(v) for v in values]
 
 def common_configuration(config_figure: dict) -> None:
-    mapping_dict = {
-        "rcParams": plt.rcParams
-    }
-    
-    for key, sub_dict in config_figure.items():
-        if isinstance(sub_dict, dict):
-            for sub_key, config in sub_dict.items():
-                if key in mapping_dict.keys():
-                    mapping_dict[key][sub_key] = config
+    # "rcParams" is the only section of the figure config applied globally
+    rc = config_figure.get("rcParams")
+    if isinstance(rc, dict):
+        plt.rcParams.update(rc)
     return
 
+# Standalone figures reused across calls, keyed by figure size. They keep the
+# default canvas: layout code (tight_layout, upsetplot) measures text with it,
+# and savefig switches to the PDF backend only when writing
+_POOL: dict[tuple, Figure] = {}
+
+def _get_fig(figsize: tuple) -> Figure:
+    """Return a cleared standalone figure of the given size, reusing a pooled one when available."""
+    key = tuple(figsize)
+    fig = _POOL.get(key)
+    if fig is None:
+        fig = Figure(figsize=key)
+        _POOL[key] = fig
+    else:
+        fig.clear()
+        # clear() keeps subplot parameters changed by earlier layouts
+        fig.subplots_adjust(**{
+            name: plt.rcParams[f"figure.subplot.{name}"]
+            for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+        })
+    return fig
+
+def _save_figure(
+    save_path: str,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False,
+    fig=None,
+    **kwargs
+) -> None:
+    """
+    Save the current (or given) figure as a PDF at `save_path`, or append it
+    as a page of `pdf_pages` when provided so that a batch of figures shares
+    one file and its font tables.
+
+    With `raster_preview`, a low-resolution PNG is written next to
+    `save_path` instead, which is much faster while iterating on a figure.
+    """
+    if fig is None:
+        fig = plt.gcf()
+
+    if raster_preview:
+        preview_path = os.path.splitext(save_path)[0] + ".png"
+        _ensure_dir(preview_path)
+        # The preview always uses its own low resolution
+        kwargs["dpi"] = 100
+        fig.savefig(preview_path, format='png', bbox_inches='tight',
+                    pil_kwargs={"compress_level": 3}, **kwargs)
+        return
+
+    # bbox_inches='tight' is kept on purpose: annotations, upset matrices and
+    # rotated tick labels extend past the figure area, and tight_layout alone
+    # clips them
+    if pdf_pages is not None:
+        pdf_pages.savefig(fig, bbox_inches='tight', **kwargs)
+        return
+
+    # Ensure the directory exists
+    _ensure_dir(save_path)
+    fig.savefig(save_path, format='pdf', bbox_inches='tight', metadata={"CreationDate": None}, **kwargs)
+
 def line_chart_frequencies(
     data: list, 
     legends: dict[Literal["x", "y"], str], 
@@ -37,55 +103,58 @@ def line_chart_frequencies(
     config_figure: dict,
     fig_offset: float = 0.7,
     fig_figsize: tuple = (3.5, 2.25),
-    fig_ylim: list = [0, 25]
+    fig_ylim: list = [0, 25],
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     common_configuration(config_figure)
 
-    # Count the frequency of each value
-    data_count = Counter(data)
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
+    markersize = config_figure["size"]["markersize"]
+    linewidth = config_figure["width"]["linewidth"]
 
-    # Sort the values in ascending order
-    data_vals = sorted(data_count.keys())
-    counts = [data_count[y] for y in data_vals]
+    # Count the frequency of each value; np.unique returns them in ascending order
+    data_vals, counts = np.unique(np.asarray(data), return_counts=True)
 
     # Plot the line chart
-    plt.figure(figsize=fig_figsize)
-    plt.plot(
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
+    ax.plot(
         data_vals, 
         counts, 
         marker='o', 
-        markersize=config_figure["size"]["markersize"],
+        markersize=markersize,
         linestyle='-', 
-        linewidth=config_figure["width"]["linewidth"]
+        linewidth=linewidth
     )
 
     # Annotate each data point with its value
     for x, y in zip(data_vals, counts):
-        plt.text(
+        ax.text(
             x, 
             y + fig_offset, 
             str(y), 
             ha='center', 
             va='bottom', 
-            fontsize=config_figure["size"]["usual_fontsize"]
+            fontsize=usual_fs
         )
 
     # Set axis labels
-    plt.xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.grid(True, linestyle='--', alpha=0.6)
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
+    ax.grid(True, linestyle='--', alpha=0.6)
 
     # Set ticks
-    plt.xticks(data_vals, fontsize=config_figure["size"]["usual_fontsize"])
-    plt.yticks(fontsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xticks(data_vals)
+    ax.tick_params(axis='both', labelsize=usual_fs)
 
     # Set y-axis limits
-    plt.ylim(fig_ylim)
+    ax.set_ylim(fig_ylim)
 
     # Save the figure to the specified path
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"The line chart has been saved to {save_path}")
 
 
@@ -97,7 +166,9 @@ def line_chart_general(
     config_figure: dict,
     fig_offset: float = 0.3,              # Text offset above each data point
     fig_figsize: tuple = (5, 3),
-    fig_ylim: list | None = None          # Optional Y-axis limit
+    fig_ylim: list | None = None,         # Optional Y-axis limit
+    pdf_pages: PdfPages | None = None,    # Append to a multi-page PDF instead of save_path
+    raster_preview: bool = False          # Write a quick PNG preview instead of the PDF
 ) -> None:
     """
     Plot multiple line charts on the same figure.
@@ -125,7 +196,14 @@ def line_chart_general(
 
     common_configuration(config_figure)  
 
-    plt.figure(figsize=fig_figsize)
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
+    markersize = config_figure["size"]["markersize"]
+    linewidth = config_figure["width"]["linewidth"]
+
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
 
     for label, y_vals in y_data.items():
         if len(x_data) != len(y_vals):
@@ -135,41 +213,40 @@ def line_chart_general(
             )
 
         # Plot a single line
-        plt.plot(
+        ax.plot(
             x_data, y_vals,
             marker='o',
-            markersize=config_figure["size"]["markersize"],
-            linewidth=config_figure["width"]["linewidth"],
+            markersize=markersize,
+            linewidth=linewidth,
             label=label
         )
 
         # Annotate each point with its value
-        for x, y in zip(x_data, y_vals):
-            plt.text(
+        for x, y, text in zip(x_data, y_vals, _value_labels(y_vals)):
+            ax.text(
                 x,
                 y + fig_offset,
-                f"{y:.2f}" if isinstance(y, float) else str(y),
+                text,
                 ha='center',
                 va='bottom',
-                fontsize=config_figure["size"]["usual_fontsize"]
+                fontsize=usual_fs
             )
 
     # Axis labels and styles
-    plt.xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.xticks(x_data, fontsize=config_figure["size"]["usual_fontsize"])
-    plt.yticks(fontsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.set_xticks(x_data)
+    ax.tick_params(axis='both', labelsize=usual_fs)
     if fig_ylim:
-        plt.ylim(fig_ylim)
+        ax.set_ylim(fig_ylim)
 
     # Add legend to distinguish multiple lines
-    plt.legend(title="Legend", fontsize=config_figure["size"]["usual_fontsize"])
-    plt.tight_layout()
+    ax.legend(title="Legend", fontsize=usual_fs)
+    fig.tight_layout()
 
     # Save the figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"Line chart is saved to {save_path}")
 
 def horizontal_stacked_bar_chart(
@@ -180,39 +257,45 @@ def horizontal_stacked_bar_chart(
     fig_figsize: tuple = (5, 3),
     fig_anno_color: str = 'black',
     fig_edge_color: str = 'white',
-    fig_title: str = ""
+    fig_title: str = "",
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ):
     common_configuration(config_figure)  
+
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
     
-    #  Calculate ratios
-    total = sum(counts)
-    ratios = [c / total for c in counts]
+    #  Calculate ratios and the left edge of each segment
+    counts_arr = np.asarray(counts, dtype=float)
+    ratios = counts_arr / counts_arr.sum()
+    lefts = np.concatenate(([0.0], np.cumsum(ratios)[:-1]))
 
     #  Plot horizontal stacked bar chart
-    colors = plt.cm.Pastel1.colors # type: ignore
-
-    fig, ax = plt.subplots(figsize=fig_figsize)
-
-    left = 0
-    for i, (ratio, label, count) in enumerate(zip(ratios, labels, counts)):
-        ax.barh(
-            0,
-            ratio,
-            left=left,
-            color=colors[i % len(colors)],
-            edgecolor=fig_edge_color
-        )
-        ax.text(
-            left + ratio / 2,
-            0,
-            f'{label}\n{ratio * 100:.1f}% ({count})',  # Display label, percentage, and count
-            ha='center',
-            va='center',
-            color=fig_anno_color,
-            fontsize=config_figure["size"]["usual_fontsize"],
-            fontweight='bold'  # Bold font for better visibility
-        )
-        left += ratio
+    colors = _PASTEL1_RGBA[np.arange(len(ratios)) % len(_PASTEL1_RGBA)]
+
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
+
+    bars = ax.barh(
+        np.zeros(len(ratios)),
+        ratios,
+        left=lefts,
+        color=colors,
+        edgecolor=fig_edge_color
+    )
+    ax.bar_label(
+        bars,
+        labels=[
+            f'{label}\n{ratio * 100:.1f}% ({count})'  # Display label, percentage, and count
+            for label, ratio, count in zip(labels, ratios, counts)
+        ],
+        label_type='center',
+        color=fig_anno_color,
+        fontsize=usual_fs,
+        fontweight='bold'  # Bold font for better visibility
+    )
 
     # Customize axes
     ax.set_xlim(0, 1)
@@ -220,11 +303,10 @@ def horizontal_stacked_bar_chart(
     ax.set_xticks([])
     ax.set_frame_on(False)
 
-    plt.title(fig_title, fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
+    ax.set_title(fig_title, fontsize=axis_fs, fontweight='bold')
 
     # Save the figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"Horizontal stacked bar chart saved to {save_path}")
 
 def bar_chart_general(
@@ -242,25 +324,32 @@ def bar_chart_general(
     legend_handletextpad: float = 0.3,          
     legend_columnspacing: float = 0.5,    
     legend_labelspacing: float = 0.2,    
-    legend_nlocal: float | None = None
+    legend_nlocal: float | None = None,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     """
     Plot multiple bar charts on the same figure (grouped bars) with optional features.
     """
     common_configuration(config_figure)  
 
-    plt.figure(figsize=fig_figsize)
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
+
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
 
     n_series = len(y_data)
     bar_width = config_figure.get("width", {}).get("barwidth", 0.8 / n_series)
     x_indices = range(len(x_data))
 
-    # Assign colors to each series, cycling through a predefined color list if necessary
-    base_colors = list(mcolors.TABLEAU_COLORS.values())
-    if len(y_data) > len(base_colors):
-        # Extend the color list by repeating it
-        base_colors *= (len(y_data) // len(base_colors) + 1)
-    colors = [mcolors.to_rgba(c, alpha=0.7) for c in base_colors[:n_series]]
+    # Assign colors to each series, cycling through the predefined color table if necessary
+    colors = _TABLEAU_RGBA[np.arange(n_series) % len(_TABLEAU_RGBA)]
+
+    # x positions for grouped bars: one row per series
+    offsets = (np.arange(n_series) - (n_series - 1) / 2) * bar_width
+    positions = np.arange(len(x_data))[None, :] + offsets[:, None]
 
     for i, (label, y_vals) in enumerate(y_data.items()):
         if len(x_data) != len(y_vals):
@@ -269,12 +358,9 @@ def bar_chart_general(
                 f"does not match the length of x_data ({len(x_data)})!"
             )
 
-        # Calculate x positions for grouped bars
-        x_positions = [x + i * bar_width - (bar_width * (n_series - 1) / 2) for x in x_indices]
-
         # Plot bars for the current series
-        bars = plt.bar(
-            x_positions,
+        ax.bar(
+            positions[i],
             y_vals,
             width=bar_width,
             label=label,
@@ -284,33 +370,33 @@ def bar_chart_general(
 
         # Annotate each bar with its value
         if if_data:
-            for bar, y in zip(bars, y_vals):
-                plt.text(
-                    bar.get_x() + bar.get_width() / 2,
+            for x, y, text in zip(positions[i], y_vals, _value_labels(y_vals)):
+                ax.text(
+                    x,                              # Bars are centered on their position
                     y + fig_offset,
-                    f"{y:.2f}" if isinstance(y, float) else str(y),
+                    text,
                     ha='center',
                     va='bottom',
-                    fontsize=config_figure["size"]["usual_fontsize"]
+                    fontsize=usual_fs
                 )
 
     # Axis labels and styles
-    plt.xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    plt.grid(True, axis='y', linestyle='--', alpha=0.6)
-    plt.xticks(x_indices, x_data, fontsize=config_figure["size"]["usual_fontsize"])
-    plt.yticks(fontsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
+    ax.grid(True, axis='y', linestyle='--', alpha=0.6)
+    ax.set_xticks(x_indices, x_data)
+    ax.tick_params(axis='both', labelsize=usual_fs)
     if fig_ylim:
-        plt.ylim(fig_ylim)
+        ax.set_ylim(fig_ylim)
 
     # Add legend if required
     if if_legend:
         if legend_nlocal == None:
             legend_nlocal = n_series
 
-        plt.legend(
+        ax.legend(
             title=None,
-            fontsize=config_figure["size"]["usual_fontsize"],
+            fontsize=usual_fs,
             loc='upper center',
             bbox_to_anchor=legend_bbox_to_anchor,
             ncol=legend_nlocal,
@@ -319,11 +405,10 @@ def bar_chart_general(
             labelspacing=legend_labelspacing      
         )
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Save the figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"Bar chart is saved to {save_path}")
 
 def pie_chart(
@@ -334,34 +419,39 @@ def pie_chart(
     fig_explode = None,
     fig_startangle: int = 90,
     fig_offset: float = 0.25,
-    title: str | None = None
+    title: str | None = None,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     """
     Draw a pie chart from the data, showing percentages with counts.
     """
     common_configuration(config_figure)
 
-    # Count the frequency of each category
-    data_count = Counter(data)
-    labels = list(data_count.keys())
-    sizes = list(data_count.values())
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+
+    # Count the frequency of each category, keeping the order of first appearance
+    count_items = _count_values(data)
+    labels = [item[0] for item in count_items]
+    sizes = [item[1] for item in count_items]
 
     if fig_explode is None:
         fig_explode = [0] * len(labels)
 
     # Custom function to show percentage + count
+    total = sum(sizes)
     def autopct_with_count(pct):
-        total = sum(sizes)
         count = int(round(pct * total / 100.0))
         return f"{pct:.1f}% ({count})"
 
     # Generate pastel colors for each slice
     num_slices = len(labels)
-    colors = cm.Pastel1.colors # type: ignore
-    colors = [colors[i % len(colors)] for i in range(num_slices)]
+    colors = _PASTEL1_RGBA[np.arange(num_slices) % len(_PASTEL1_RGBA)]
 
     # Create the pie chart
-    _, ax = plt.subplots(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
     wedges, _, autotexts = ax.pie( # type: ignore
         sizes,
         labels=None,  
@@ -369,39 +459,84 @@ def pie_chart(
         startangle=fig_startangle,
         explode=fig_explode,
         colors=colors,
-        textprops={'fontsize': config_figure["size"]["usual_fontsize"]}
+        textprops={'fontsize': usual_fs}
     )
 
-    # Adjust the position of percentage texts and add labels above them
-    for i, (wedge, autotext) in enumerate(zip(wedges, autotexts)):
-        # Calculate the angle for the current wedge
-        angle = (wedge.theta2 + wedge.theta1) / 2
-        x = 0.6 * np.cos(np.deg2rad(angle))  # Use np.cos
-        y = 0.6 * np.sin(np.deg2rad(angle))  # Use np.sin
+    # Positions of the percentage texts at the middle angle of each wedge
+    angles = np.array([(wedge.theta2 + wedge.theta1) / 2 for wedge in wedges])
+    rad = np.deg2rad(angles)
+    xs = 0.6 * np.cos(rad)
+    ys = 0.6 * np.sin(rad)
 
+    # Adjust the position of percentage texts and add labels above them
+    for i, autotext in enumerate(autotexts):
         # Adjust the position of the percentage text
-        autotext.set_position((x, y))
+        autotext.set_position((xs[i], ys[i]))
 
         # Add label text above the percentage
         ax.text(
-            x, y - fig_offset,              # Position above the percentage
+            xs[i], ys[i] - fig_offset,      # Position above the percentage
             labels[i],
             ha='center',
             va='bottom',
             fontweight='bold',
-            fontsize=config_figure["size"]["usual_fontsize"]
+            fontsize=usual_fs
         )
 
-    plt.axis('equal')
+    ax.axis('equal')
 
     if title:
-        ax.set_title(title, fontsize=config_figure["size"]["usual_fontsize"], pad=2)
+        ax.set_title(title, fontsize=usual_fs, pad=2)
 
     # Save the figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"The pie chart has been saved to {save_path}")
 
+def _count_values(data: list) -> list[tuple]:
+    """
+    Count the frequency of each value and return (value, count) pairs in the
+    order of first appearance, like `Counter(data).items()`.
+    """
+    arr = np.asarray(data)
+    # Only homogeneous data: NumPy would coerce mixed types (1 and "1") into one
+    if arr.dtype.kind in "iufU" and len(set(map(type, data))) == 1:
+        # Numeric or string codes: count in NumPy
+        vals, first_idx, cnts = np.unique(arr, return_index=True, return_counts=True)
+        order = np.argsort(first_idx)
+        return list(zip(vals[order].tolist(), cnts[order].tolist()))
+    return list(Counter(data).items())
+
+def _sorted_counts(
+    data: list,
+    if_freq_sort: bool,
+    is_int_data: bool,
+    req_sort: list | None
+) -> list[tuple]:
+    """Count the frequency of each value and return the (value, count) pairs in display order."""
+    count_items = _count_values(data)
+
+    if req_sort is not None and not if_freq_sort:
+        # If req_sort is provided, sort keys according to req_sort order
+        rank = {}
+        for idx, val in enumerate(req_sort):
+            rank.setdefault(val, idx)
+        return sorted(count_items, key=lambda x: rank.get(x[0], len(req_sort)))
+    elif if_freq_sort:
+        if is_int_data:
+            # If it's an integer list, sort by numerical value ascending
+            # (values are unique, so plain tuple order is value order)
+            return sorted(count_items)
+        else:
+            # Otherwise, sort by frequency ascending + name descending
+            return sorted(
+                count_items,
+                key=lambda x: (x[1], -ord(str(x[0])[0].lower())),
+                reverse=False
+            )
+    else:
+        # No sorting, keep original order
+        return count_items
+
 def horizontal_bar_chart(
     data: list[str] | list[int],
     legends: dict[Literal["x", "y"], str], 
@@ -413,65 +548,51 @@ def horizontal_bar_chart(
     fig_xinteger: bool = True,      # Whether ticks on the x-axis should be integers
     title: str | None = None,
     if_freq_sort: bool = True,
-    req_sort: list | None = None
+    req_sort: list | None = None,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     # Common configuration
     common_configuration(config_figure)
 
-    # Statistics
-    data_count = Counter(data)
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
 
     # Detect if data is integer type
-    is_int_data = all(isinstance(x, int) for x in data)
+    is_int_data = np.asarray(data).dtype.kind in "biu"
+
+    # Statistics and sorting
+    sorted_items = _sorted_counts(data, if_freq_sort, is_int_data, req_sort)
 
-    # Sorting logic
-    if req_sort is not None and not if_freq_sort:
-        # If req_sort is provided, sort keys according to req_sort order
-        sorted_items = sorted(
-            data_count.items(),
-            key=lambda x: req_sort.index(x[0]) if x[0] in req_sort else len(req_sort)
-        )
-    elif if_freq_sort:
-        if is_int_data:
-            # If it's an integer list, sort by numerical value ascending
-            sorted_items = sorted(data_count.items(), key=lambda x: x[0])
-        else:
-            # Otherwise, sort by frequency ascending + name descending
-            sorted_items = sorted(
-                data_count.items(),
-                key=lambda x: (x[1], -ord(str(x[0])[0].lower())),  
-                reverse=False
-            )
-    else:
-        # No sorting, keep original order
-        sorted_items = list(data_count.items())
-        
     # Extract sorted data and counts
     data_vals = [item[0] for item in sorted_items]
     counts = [item[1] for item in sorted_items]
 
     # Plot Bar Chart
-    _, ax = plt.subplots(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
     y = np.arange(len(data_vals))
     bar_height = fig_barheight
 
-    bars = ax.barh(y, counts, height=bar_height, color=fig_color, alpha=0.85, edgecolor="black")
+    ax.barh(y, counts, height=bar_height, color=fig_color, alpha=0.85, edgecolor="black")
+    cmax = max(counts)
+    pad = cmax * 0.01
     ax.set_ylim(-0.5, len(data_vals)-0.5)
-    ax.set_xlim(0, max(counts)*1.18)
+    ax.set_xlim(0, cmax*1.18)
 
-    # Annotate frequencies on bars
-    for i, bar in enumerate(bars):
-        value = counts[i]
-        ax.text(bar.get_width() + max(counts)*0.01, bar.get_y() + bar.get_height()/2,
+    # Annotate frequencies on bars (bars are centered on y, so no per-bar geometry lookups)
+    for yc, value in zip(y, counts):
+        ax.text(value + pad, yc,
                 f"{value}", va="center", ha="left", fontsize=10)
 
     # Axes and labels
     ax.set_yticks(y)
-    ax.set_yticklabels(data_vals, fontsize=config_figure["size"]["usual_fontsize"]) # type: ignore
-    ax.set_ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
+    ax.set_yticklabels(data_vals, fontsize=usual_fs) # type: ignore
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
 
-    ax.set_xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.tick_params(axis='x', labelsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.tick_params(axis='x', labelsize=usual_fs)
 
     # x-axis integer ticks
     if fig_xinteger:
@@ -484,11 +605,10 @@ def horizontal_bar_chart(
     ax.spines["right"].set_visible(False)
 
     if title:
-        ax.set_title(title, fontsize=config_figure["size"]["axis_fontsize"], pad=10)
+        ax.set_title(title, fontsize=axis_fs, pad=10)
 
     # Save
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
 
     # print(f"Number of categories: {len(set(data_vals))}.")
     print(f"The horizontal bar chart has been saved to {save_path}")
@@ -499,6 +619,17 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
+@lru_cache(maxsize=1024)
+def _bin_edge_str(x: float) -> str:
+    """Format a bin edge: show integers when possible."""
+    return f"{int(x)}" if x.is_integer() else f"{x:.2f}"
+
+@lru_cache(maxsize=1024)
+def _bin_label(left: float, right: float, closed_right: bool) -> str:
+    """LaTeX label of the histogram bin [left, right) or [left, right]."""
+    closing = "]" if closed_right else ")"
+    return fr"$[{_bin_edge_str(left)},\, {_bin_edge_str(right)}{closing}$"
+
 def horizontal_histogram(
     data: list[int] | list[float],
     legends: dict[str, str],
@@ -511,25 +642,32 @@ def horizontal_histogram(
     title: str | None = None,
     bins: int | list[float] | list[int] = 10,
     upper_limit: float | None = None,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
-    # Check data type
-    if not all(isinstance(x, (int, float)) for x in data):
+    # Check data type from the array dtype instead of element by element
+    arr = np.asarray(data)
+    if arr.dtype.kind not in "biuf":
         raise ValueError("Data must be a list of int or float values.")
  
     common_configuration(config_figure)
 
-    if len(data) == 0:
-        raise ValueError("data is empty")
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
 
-    arr = np.asarray(data)
+    if arr.size == 0:
+        raise ValueError("data is empty")
 
     # When upper_limit exists: lower < upper_limit, upper >= upper_limit
+    # Split with boolean masks and keep both parts as arrays for np.digitize
+    # (two comparisons rather than ~mask, so NaN stays out of both parts)
     if upper_limit is not None:
-        lower_data = arr[arr < upper_limit].tolist()
-        upper_data = arr[arr >= upper_limit].tolist()
+        lower_data = arr[arr < upper_limit]
+        upper_data = arr[arr >= upper_limit]
     else:
-        lower_data = arr.tolist()
-        upper_data = []
+        lower_data = arr
+        upper_data = arr[:0]
 
     # Handle bins argument: construct bin_edges
     # (covering lower_data range up to upper_limit if provided)
@@ -566,76 +704,60 @@ def horizontal_histogram(
         # Use np.digitize to build left-closed right-open intervals [edge_i, edge_{i+1})
         # np.digitize indices range from 1 to N_edges-1
         indices = np.digitize(lower_data, bin_edges, right=False)
-        counts = np.zeros(len(bin_edges) - 1, dtype=int)
-        for idx in indices:
-            # idx in 1..len(bin_edges)-1 maps to counts[idx-1]
-            if 1 <= idx <= counts.size:
-                counts[idx - 1] += 1
-            # idx == 0 means value < bin_edges[0]
-            elif idx == 0:
-                # Put into the first bin (optional strategy)
-                counts[0] += 1
-            # idx > counts.size means value >= bin_edges[-1]
-            else:
-                # Ignore overflow
-                pass
+        n_bins = len(bin_edges) - 1
+        # idx == 0 means value < bin_edges[0]: put into the first bin (optional strategy)
+        indices[indices == 0] = 1
+        # idx > n_bins means value >= bin_edges[-1]: ignore overflow
+        indices = indices[indices <= n_bins]
+        # idx in 1..n_bins maps to counts[idx-1]
+        counts = np.bincount(indices - 1, minlength=n_bins)
 
     # Build bin labels: all regular bins shown as [left, right)
     # If upper_limit is None, keep the last bin right-closed
-    bin_labels = []
-    n_bins = len(bin_edges) - 1
-    for i in range(n_bins):
-        left, right = bin_edges[i], bin_edges[i + 1]
-
-        # Format values: show integers when possible
-        def fmt(x):
-            return f"{int(x)}" if float(x).is_integer() else f"{x:.2f}"
-
-        left_s, right_s = fmt(left), fmt(right)
-
-        if upper_limit is None and i == n_bins - 1:
-            # Last bin right-closed when no upper_limit (consistent with np.histogram)
-            label = fr"$[{left_s},\, {right_s}]$"
-        else:
-            label = fr"$[{left_s},\, {right_s})$"
-        bin_labels.append(label)
+    edges = bin_edges.tolist()
+    n_bins = len(edges) - 1
+    bin_labels = [
+        # Last bin right-closed when no upper_limit (consistent with np.histogram)
+        _bin_label(edges[i], edges[i + 1], upper_limit is None and i == n_bins - 1)
+        for i in range(n_bins)
+    ]
 
     # If upper_limit exists, append [upper_limit, +∞)
     if upper_limit is not None:
         upper_count = len(upper_data)
         counts = np.append(counts, upper_count)
-        upper_s = f"{int(upper_limit)}" if float(upper_limit).is_integer() else f"{upper_limit:.2f}"
-        bin_labels.append(fr"$[{upper_s},\, +\infty)$")
+        bin_labels.append(fr"$[{_bin_edge_str(float(upper_limit))},\, +\infty)$")
 
     # Force integer x-axis if bins are integer edges
-    if isinstance(bins, (list, np.ndarray)) and all(float(b).is_integer() for b in bin_edges):
+    if isinstance(bins, (list, np.ndarray)) and np.all(np.mod(bin_edges, 1) == 0):
         fig_xinteger = True
 
     # Plot
-    _, ax = plt.subplots(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
     y = np.arange(len(bin_labels))
-    bars = ax.barh(y, counts, height=fig_barheight,
-                   color=fig_color, alpha=0.85, edgecolor="black")
+    ax.barh(y, counts, height=fig_barheight,
+            color=fig_color, alpha=0.85, edgecolor="black")
 
+    cmax = counts.max() if len(counts) > 0 else 0
+    pad = cmax * 0.01 if cmax > 0 else 0.1
     ax.set_ylim(-0.5, len(bin_labels) - 0.5)
-    ax.set_xlim(0, max(counts) * 1.18 if max(counts) > 0 else 1)
+    ax.set_xlim(0, cmax * 1.18 if cmax > 0 else 1)
 
-    # Annotate frequencies
-    max_c = max(counts) if len(counts) > 0 else 0
-    for i, bar in enumerate(bars):
-        value = int(counts[i])
+    # Annotate frequencies (bars are centered on y)
+    for yc, value in zip(y, counts.tolist()):
         ax.text(
-            bar.get_width() + (max_c * 0.01 if max_c > 0 else 0.1),
-            bar.get_y() + bar.get_height() / 2,
+            value + pad,
+            yc,
             f"{value}", va="center", ha="left", fontsize=10
         )
 
     # Axes and labels
     ax.set_yticks(y)
-    ax.set_yticklabels(bin_labels, fontsize=config_figure["size"]["usual_fontsize"])  # type: ignore
-    ax.set_ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.set_xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.tick_params(axis='x', labelsize=config_figure["size"]["usual_fontsize"])
+    ax.set_yticklabels(bin_labels, fontsize=usual_fs)  # type: ignore
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.tick_params(axis='x', labelsize=usual_fs)
 
     if fig_xinteger:
         ax.xaxis.set_major_locator(MaxNLocator(integer=True))
@@ -647,12 +769,10 @@ def horizontal_histogram(
     ax.spines["right"].set_visible(False)
 
     if title:
-        ax.set_title(title, fontsize=config_figure["size"]["axis_fontsize"], pad=10)
+        ax.set_title(title, fontsize=axis_fs, pad=10)
 
     # Save figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
-    plt.close()
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
 
     print(f"The horizontal histogram has been saved to {save_path}")
 
@@ -670,7 +790,9 @@ def vertical_bar_chart(
     rotation_angle: int = 30,
     if_freq_sort: bool = True,          # If sort by frequency
     is_int_data: bool = False,          # Whether data is integer type
-    req_sort: list | None = None
+    req_sort: list | None = None,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     """
     Draw a vertical bar chart from the data, showing frequencies.
@@ -678,41 +800,26 @@ def vertical_bar_chart(
 
     common_configuration(config_figure)
 
-    # Count the frequency of each category
-    data_count = Counter(data)
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
 
-    # Sorting logic
-    if req_sort is not None and not if_freq_sort:
-        # If req_sort is provided, sort keys according to req_sort order
-        sorted_items = sorted(
-            data_count.items(),
-            key=lambda x: req_sort.index(x[0]) if x[0] in req_sort else len(req_sort)
-        )
-    elif if_freq_sort:
-        if is_int_data:
-            # If it's an integer list, sort by numerical value ascending
-            sorted_items = sorted(data_count.items(), key=lambda x: x[0])
-        else:
-            # Otherwise, sort by frequency ascending + name descending
-            sorted_items = sorted(
-                data_count.items(),
-                key=lambda x: (x[1], -ord(str(x[0])[0].lower())),  
-                reverse=False
-            )
-    else:
-        # No sorting, keep original order
-        sorted_items = list(data_count.items())
+    # Count the frequency of each category and sort
+    sorted_items = _sorted_counts(data, if_freq_sort, is_int_data, req_sort)
 
     data_vals = [item[0] for item in sorted_items]
     counts = [item[1] for item in sorted_items]
 
     # Plot Bar Chart
-    _, ax = plt.subplots(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
     x = np.arange(len(data_vals))
     bars = ax.bar(x, counts, width=fig_barwidth, color=fig_color, alpha=0.85, edgecolor="black")
 
     # Set limits
-    ax.set_ylim(0, max(counts) * 1.18)
+    cmax = max(counts)
+    pad = cmax * 0.01
+    ax.set_ylim(0, cmax * 1.18)
     ax.set_xlim(-0.5, len(data_vals) - 0.5)
 
     # Annotate frequencies on bars
@@ -720,7 +827,7 @@ def vertical_bar_chart(
         value = counts[i]
         ax.text(
             bar.get_x() + bar.get_width() / 2,
-            bar.get_height() + max(counts) * 0.01,
+            bar.get_height() + pad,
             f"{value}",
             ha="center",
             va="bottom",
@@ -729,13 +836,13 @@ def vertical_bar_chart(
 
     # Axes and labels
     ax.set_xticks(x)
-    ax.set_xticklabels(data_vals, fontsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xticklabels(data_vals, fontsize=usual_fs)
     if rotate_xticks or any(len(label) > 8 for label in data_vals):
         plt.setp(ax.get_xticklabels(), rotation=rotation_angle, ha="right")
 
-    ax.set_xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.set_ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.tick_params(axis='y', labelsize=config_figure["size"]["usual_fontsize"])
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
+    ax.tick_params(axis='y', labelsize=usual_fs)
     if fig_yinteger:
         ax.yaxis.set_major_locator(MaxNLocator(integer=True))
 
@@ -745,14 +852,44 @@ def vertical_bar_chart(
     ax.spines["right"].set_visible(False)
 
     if title:
-        ax.set_title(title, fontsize=config_figure["size"]["axis_fontsize"], pad=10)
+        ax.set_title(title, fontsize=axis_fs, pad=10)
 
     # Save
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"The vertical bar chart has been saved to {save_path}")
 
 
+@lru_cache(maxsize=2048)
+def _format_large_ticks(x: float, integer: bool) -> str:
+    """Show only integers on the x-axis & automatically simplify large values (1K, 1M, etc.)"""
+    if abs(x) >= 1_000_000:
+        if integer:
+            # Strict mode: allow only integer millions
+            return f"{x/1_000_000:.0f}M"
+        else:
+            # Non-integer mode: allow decimal millions
+            return f"{x/1_000_000:.2f}M".rstrip('0').rstrip('.')
+
+    elif abs(x) >= 1_000:
+        return f"{x/1_000:.0f}K"
+
+    else:
+        if integer and abs(x - round(x)) < 1e-6:
+            return f"{int(round(x))}"
+        return f"{x:.2f}"
+
+def _box_line_gray(n_boxes: int) -> tuple:
+    # Seaborn maps wide-form boxes to the color cycle (husl beyond its length)
+    # and draws the lines in a gray at 60% of the darkest palette lightness
+    cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    if n_boxes <= len(cycle):
+        palette = [mcolors.to_rgb(c) for c in cycle[:max(n_boxes, 1)]]
+    else:
+        import seaborn as sns
+        palette = sns.color_palette("husl", n_boxes)
+    lum = min(colorsys.rgb_to_hls(*rgb)[1] for rgb in palette) * 0.6
+    return (lum, lum, lum)
+
 def horizontal_boxplot(
     data: list[np.ndarray],
     legends: dict[Literal["x", "y"], str],
@@ -770,67 +907,94 @@ def horizontal_boxplot(
     fig_max_offset: tuple = (0, 6), 
     samplesize_name = None,
     show_points: bool = True,
-    point_mode: Literal["strip", "swarm"] = "swarm",
+    point_mode: Literal["strip", "swarm"] = "strip",
+    rasterize_points: bool = False,         # Embed the data points as an image in the PDF
+    rasterize_dpi: int = 300,
     no_ytick: bool = False,
-    legend_only: bool = False
+    legend_only: bool = False,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
-    # Show only integers on the x-axis & automatically simplify large values (1K, 1M, etc.)
-    def format_large_ticks(x, pos):
- 
-        if abs(x) >= 1_000_000:
-            if fig_xinteger:
-                # Strict mode: allow only integer millions
-                return f"{x/1_000_000:.0f}M"
-            else:
-                # Non-integer mode: allow decimal millions
-                return f"{x/1_000_000:.2f}M".rstrip('0').rstrip('.')
-
-        elif abs(x) >= 1_000:
-            return f"{x/1_000:.0f}K"
-
-        else:
-            if fig_xinteger and abs(x - round(x)) < 1e-6:
-                return f"{int(round(x))}"
-            return f"{x:.2f}"
-        
     """Draw a horizontal boxplot with data points and statistical annotations"""
     common_configuration(config_figure)
 
-    plt.figure(figsize=fig_figsize)
-    ax = sns.boxplot(
-        data=data,
-        color=fig_color,
-        width=fig_boxwidth,
-        fliersize=3,
-        zorder=1,
-        orient='h'
+    # Font sizes and label offsets looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
+    median_offset = tuple(fig_median_offset)
+    max_offset = tuple(fig_max_offset)
+
+    # Pooled standalone figure, kept out of the pyplot figure manager
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
+
+    # Seaborn's box style: fill desaturated to 75%, lines in its palette-derived gray
+    hue, lightness, saturation = colorsys.rgb_to_hls(*mcolors.to_rgb(fig_color))
+    box_color = colorsys.hls_to_rgb(hue, lightness, saturation * 0.75)
+    line_color = _box_line_gray(len(data))
+    bp = ax.boxplot(
+        data,
+        vert=False,
+        positions=np.arange(len(data)),   # Keep the i-th box at y = i
+        widths=fig_boxwidth,
+        capwidths=0.5 * fig_boxwidth,
+        patch_artist=True,
+        boxprops={"facecolor": box_color, "edgecolor": line_color},
+        medianprops={"color": line_color, "solid_capstyle": "butt"},
+        whiskerprops={"color": line_color, "solid_capstyle": "butt"},
+        capprops={"color": line_color},
+        flierprops={"markersize": 3, "markeredgecolor": line_color},
+        zorder=1
     )
 
+    # Fit the y-limits to the boxes with a 5% margin, as seaborn's autoscale did,
+    # instead of boxplot's +-0.5 per position; inverted so the first series is on top
+    y_pad = fig_boxwidth / 2 + 0.05 * (len(data) - 1 + fig_boxwidth)
+    ax.set_ylim(len(data) - 1 + y_pad, -y_pad)
+
+    # Points stay within the box band (80% of its width)
+    point_band = 0.4 * fig_boxwidth
+
     # Draw scatter points
     if show_points:
         if point_mode == "strip":
-            sns.stripplot(
-                data=data,
-                color='grey',
-                size=fig_pointsize,
-                alpha=fig_scatteralpha,
-                jitter=True,
-                zorder=3,
-                orient='h'
-            )
+            # Jitter points vertically around each box
+            rng = np.random.default_rng(0)
+            for i, vals in enumerate(data):
+                v = np.asarray(vals)
+                ax.scatter(
+                    v,
+                    i + rng.uniform(-point_band, point_band, v.size),
+                    s=fig_pointsize**2,
+                    c='grey',
+                    alpha=fig_scatteralpha,
+                    zorder=3,
+                    rasterized=rasterize_points
+                )
         elif point_mode == "swarm":
-            sns.swarmplot(
-                data=data,
-                color='grey',
-                size=fig_pointsize,
-                alpha=fig_scatteralpha,
-                zorder=3,
-                orient='h'
-            )
+            # Lay out the swarm in display units so that markers do not overlap
+            x_lo, x_hi = ax.get_xlim()
+            y_lo, y_hi = ax.get_ylim()
+            bbox = ax.get_window_extent()
+            x_scale = bbox.width / abs(x_hi - x_lo)
+            y_scale = bbox.height / abs(y_hi - y_lo)
+            diameter = fig_pointsize * fig.dpi / 72
+            for i, vals in enumerate(data):
+                v = np.asarray(vals, dtype=float)
+                offsets = swarm_layout(v * x_scale, 0.0, diameter)
+                ax.scatter(
+                    v,
+                    i + np.clip(offsets / y_scale, -point_band, point_band),   # Crowded points pile up at the band edge
+                    s=fig_pointsize**2,
+                    c='grey',
+                    alpha=fig_scatteralpha,
+                    zorder=3,
+                    rasterized=rasterize_points
+                )
 
     # Axis labels
-    ax.set_xlabel(legends["x"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
-    ax.set_ylabel(legends["y"], fontsize=config_figure["size"]["axis_fontsize"], fontweight='bold')
+    ax.set_xlabel(legends["x"], fontsize=axis_fs, fontweight='bold')
+    ax.set_ylabel(legends["y"], fontsize=axis_fs, fontweight='bold')
 
     # If no_ytick is True, hide y-axis ticks and labels
     if no_ytick:
@@ -839,7 +1003,7 @@ def horizontal_boxplot(
         ax.tick_params(axis='y', length=0)     # Remove tick marks
 
     # Show only integers on the x-axis ---
-    ax.xaxis.set_major_formatter(FuncFormatter(format_large_ticks))
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: _format_large_ticks(x, fig_xinteger)))
 
     if fig_xinteger:
         ax.xaxis.set_major_locator(MaxNLocator(integer=True))
@@ -849,26 +1013,58 @@ def horizontal_boxplot(
     ax.set_axisbelow(True)
 
     # Automatically extract boxplot whiskers
-    # matplotlib boxplot objects
-    box_dict = ax.artists  # Each box
-    whiskers = ax.lines    # Whiskers are stored in lines; note the indexing rule
-
-    for i, vals in enumerate(data):
-        vals = np.asarray(vals)
-        n = len(vals)
-        # Median
-        q2 = np.percentile(vals, 50)
-
-        # Get whiskers
-        lower_whisker = whiskers[2*i].get_xdata()[1]      # type: ignore # Lower whisker of the i-th box
-        upper_whisker = whiskers[2*i+1].get_xdata()[1]    # type: ignore # Upper whisker of the i-th box
-
-        min_v, max_v, median = lower_whisker, upper_whisker, q2
+    # Whiskers are ordered as [lower_0, upper_0, lower_1, upper_1, ...]
+    whiskers = bp["whiskers"]
+
+    # Compute all medians in one call when the series share the same length,
+    # otherwise in one pass of the ragged-median kernel
+    lens = [len(vals) for vals in data]
+    if len(set(lens)) <= 1:
+        medians = np.median(np.asarray(data), axis=1) if data else np.array([])
+    else:
+        bounds = np.concatenate(([0], np.cumsum(lens)))
+        medians = grouped_medians(np.concatenate(data).astype(float), bounds)
+    mins = [w.get_xdata()[1] for w in whiskers[0::2]]    # type: ignore # Lower whiskers
+    maxs = [w.get_xdata()[1] for w in whiskers[1::2]]    # type: ignore # Upper whiskers
+
+    # Control data display format (independent from axis formatting)
+    # Format all annotated values in one pass
+    fmt = "%d" if fig_datainteger else "%.2f"
+    def format_data_values(values):
+        values = np.asarray(values, dtype=float)
+        return np.char.mod(fmt, np.round(values) if fig_datainteger else values)
+
+    med_str = format_data_values(medians)
+    max_str = format_data_values(maxs)
+    min_str = format_data_values(mins)
+
+    # Median, maximum (upper whisker) and minimum (lower whisker) markers, one collection each
+    if len(data) > 0:
+        y_positions = np.arange(len(data))
+        ax.scatter(medians, y_positions, color='red', marker='o', s=30,
+                   zorder=5, label='Median')
+        ax.scatter(maxs, y_positions, color='#8E44AD', marker='>',
+                   s=fig_extremesize, zorder=5, label='Upper whisker')
+        ax.scatter(mins, y_positions, color='#16A085', marker='<',
+                   s=fig_extremesize, zorder=5, label='Lower whisker')
+
+    # Data position shifted by a fixed offset in points, shared by all labels of a kind
+    def offset_transform(offset):
+        dx, dy = offset
+        return ax.transData + ScaledTranslation(dx / 72, dy / 72, fig.dpi_scale_trans)
+
+    median_trans = offset_transform(median_offset)
+    max_trans = offset_transform(max_offset)
+    min_trans = offset_transform((-20, -2))
+
+    for i in range(len(data)):
+        n = lens[i]
+        min_v, max_v, median = mins[i], maxs[i], medians[i]
         y_pos = i
 
         if samplesize_name is not None:
             if len(data) == 1:
-                ax.set_title(f"{samplesize_name} = {n}", fontsize=config_figure["size"]["axis_fontsize"])
+                ax.set_title(f"{samplesize_name} = {n}", fontsize=axis_fs)
             else:
                 ax.text(
                     max_v + (max_v - min_v) * 0.05, y_pos,  # type: ignore
@@ -876,64 +1072,43 @@ def horizontal_boxplot(
                     va='center', ha='left', fontsize=8, color='black', zorder=5
                 )
 
-        # Control data display format (independent from axis formatting)
-        def format_data_value(v):
-            if fig_datainteger:
-                return f"{int(round(v))}"
-            else:
-                return f"{v:.2f}"
-
-        annotated_data = {
-            "median": format_data_value(median),
-            "maximum": format_data_value(max_v),
-            "minimum": format_data_value(min_v),
-        }
-
         # Median
-        ax.scatter(median, y_pos, color='red', marker='o', s=30,
-                   zorder=5, label='Median' if i == 0 else "")
-        ax.annotate(
-            annotated_data["median"], (median, y_pos), xytext=fig_median_offset,  # type: ignore
-            textcoords='offset points',
-            fontsize=config_figure["size"]["usual_fontsize"],
+        ax.text(
+            median, y_pos, med_str[i],  # type: ignore
+            transform=median_trans,
+            fontsize=usual_fs,
             color='red', va='center', fontweight='bold'
         )
 
         # Maximum (upper whisker)
-        ax.scatter(max_v, y_pos, color='#8E44AD', marker='>',
-                   s=fig_extremesize, zorder=5, label='Upper whisker' if i == 0 else "")
-        ax.annotate(
-            annotated_data["maximum"], (max_v, y_pos), xytext=fig_max_offset,  # type: ignore
-            textcoords='offset points',
-            fontsize=config_figure["size"]["usual_fontsize"],
+        ax.text(
+            max_v, y_pos, max_str[i],  # type: ignore
+            transform=max_trans,
+            fontsize=usual_fs,
             color='#8E44AD', va='bottom', fontweight='bold'
         )
 
         # Minimum (lower whisker)
-        ax.scatter(min_v, y_pos, color='#16A085', marker='<',
-                   s=fig_extremesize, zorder=5, label='Lower whisker' if i == 0 else "")
-        ax.annotate(
-            annotated_data["minimum"], (min_v, y_pos), xytext=(-20, -2),  # type: ignore
-            textcoords='offset points',
-            fontsize=config_figure["size"]["usual_fontsize"],
+        ax.text(
+            min_v, y_pos, min_str[i],  # type: ignore
+            transform=min_trans,
+            fontsize=usual_fs,
             color='#16A085', va='top', fontweight='bold'
         )
 
     # Save figure or legend only
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
     if legend_only:
         handles, labels = ax.get_legend_handles_labels()
         by_label = dict(zip(labels, handles))
         if by_label:
-            legend_fig = plt.figure(figsize=fig_figsize)
+            legend_fig = Figure(figsize=fig_figsize)
             leg = legend_fig.legend(
                 handles=by_label.values(),
                 labels=by_label.keys(),
                 loc='center',
                 ncol=len(by_label),
                 frameon=True,   # Must be True, otherwise the frame will not be rendered
-                fontsize=config_figure["size"]["axis_fontsize"],
+                fontsize=axis_fs,
                 handlelength=1.2,
                 columnspacing=0.8
             )
@@ -944,9 +1119,11 @@ def horizontal_boxplot(
             frame.set_linewidth(0.8)       # Border width
             frame.set_facecolor('white')   # Optional: white background
             frame.set_alpha(1.0)           # Optional: fully opaque
-            legend_fig.savefig(save_path, bbox_inches='tight', pad_inches=0)
+            _save_figure(save_path, pdf_pages, raster_preview, fig=legend_fig, pad_inches=0)
+    elif rasterize_points and show_points:
+        _save_figure(save_path, pdf_pages, raster_preview, fig=fig, dpi=rasterize_dpi)
     else:
-        plt.savefig(save_path, format='pdf', bbox_inches='tight')
+        _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
 
     figure_type = "legend" if legend_only else "boxplot"
     print(f"The {figure_type} has been saved to {save_path}")
@@ -959,8 +1136,13 @@ def upset_plot(
     config_figure: dict,
     fig_figsize: tuple = (2, 2.5),
     fig_color: str = "#B7B5B7F8",
-    fig_wspace: float = -0.5
+    fig_wspace: float = -0.5,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ):
+    # Imported lazily: upsetplot pulls in pandas
+    from upsetplot import UpSet, from_memberships
+
     memberships = data["memberships"]
     values = data["values"]
 
@@ -978,16 +1160,16 @@ def upset_plot(
         facecolor=fig_color
     )
 
-    # Draw the UpSet plot
-    upset.plot(fig=plt.figure(figsize=fig_figsize))
-    fig = plt.gcf()                       # Get the current figure
-    fig.set_size_inches(*fig_figsize)     # Adjust size again afterwards
+    # Draw the UpSet plot on a pooled figure
+    fig = _get_fig(fig_figsize)
+    upset.plot(fig=fig)
+    fig.set_size_inches(*fig_figsize)     # upsetplot resizes the figure; restore the requested size
 
     # Adjust subplot parameters to make left and right subplots more compact
-    plt.subplots_adjust(wspace=fig_wspace)
+    fig.subplots_adjust(wspace=fig_wspace)
 
     # Save the image
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"The upset plot has been saved to {save_path}")
 
 
@@ -999,19 +1181,23 @@ def two_labels_venn(
     config_figure: dict,
     fig_figsize: tuple = (2, 2.5),
     ellipse: float | None = None,               # Circle → ellipse scaling factor
-    label_offset: dict | None = None            # New: label offset configuration
+    label_offset: dict | None = None,           # New: label offset configuration
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ):
+    from matplotlib_venn import venn2
+
     # Common configuration
     common_configuration(config_figure)
 
-    plt.figure(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
+    ax = fig.subplots()
 
     # Pastel colors
-    colors = cm.Pastel1.colors  # type: ignore
-    colors = [colors[i % len(colors)] for i in range(2)]
+    colors = _PASTEL1_RGBA[:2]
 
     # Draw Venn diagram
-    v = venn2(subsets=counts, set_labels=labels)
+    v = venn2(subsets=counts, set_labels=labels, ax=ax)
 
     # Set colors
     if v.get_patch_by_id("10"):
@@ -1040,7 +1226,7 @@ def two_labels_venn(
         for region in ["10", "01", "11"]:
             patch = v.get_patch_by_id(region)
             if patch is not None:
-                trans = Affine2D().scale(ellipse, 1.0) + plt.gca().transData
+                trans = Affine2D().scale(ellipse, 1.0) + ax.transData
                 patch.set_transform(trans)
 
     # Label offset feature
@@ -1055,7 +1241,7 @@ def two_labels_venn(
             label.set_position((x + dx, y + dy))
 
     # Save figure
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
     print(f"The Venn plot has been saved to {save_path}")
 
 
@@ -1068,7 +1254,9 @@ def two_dimensional_heatmap(
     config_figure: dict,
     fig_figsize: tuple = (2, 2.5),
     cmap: str = "Blues",
-    annot: bool = True
+    annot: bool = True,
+    pdf_pages: PdfPages | None = None,
+    raster_preview: bool = False
 ) -> None:
     """
     Convert a two-dimensional dictionary into a heatmap and save it as an image
@@ -1077,86 +1265,99 @@ def two_dimensional_heatmap(
     data_dict: dict[row][col] = value
                (stored as strings, but will be converted to numbers when possible)
     """
+    # Imported lazily: seaborn and pandas are only needed for heatmaps
+    import pandas as pd
+    import seaborn as sns
 
     common_configuration(config_figure)  # Assume a custom configuration function exists
 
+    # Sizes from the figure config, looked up once
+    usual_fs = config_figure["size"]["usual_fontsize"]
+    axis_fs = config_figure["size"]["axis_fontsize"]
+
     # Rows
     rows = sorted(data_dict.keys())
 
     # Collect all column names
-    col_set = set()
-    for r in rows:
-        col_set.update(data_dict[r].keys())
-    
+    col_set = set().union(*(data_dict[r].keys() for r in rows))
+
     # X-axis column order: follow desired_order, keep only columns existing in data
     cols = [c for c in desired_order if c in col_set]
 
-    # Construct DataFrame
-    table = []
-    for r in rows:
-        row_vals = []
-        for c in cols:
-            v = data_dict[r].get(c, "")
-            try:
-                v = float(v)
-            except:
-                v = np.nan
-            row_vals.append(v)
-        table.append(row_vals)
-
-    df = pd.DataFrame(table, index=rows, columns=cols)
+    # Construct DataFrame; missing cells and non-numeric values become NaN
+    df = pd.DataFrame.from_dict(data_dict, orient="index").reindex(index=rows, columns=cols)
+    df = df.apply(pd.to_numeric, errors="coerce")
 
     # Draw heatmap
-    plt.figure(figsize=fig_figsize)
+    fig = _get_fig(fig_figsize)
     ax = sns.heatmap(
         df,
+        ax=fig.subplots(),
         cmap=cmap,
         annot=annot,
         fmt=".0f",
         linewidths=1,               # Cell border width
         linecolor="black",          # Cell border color
         annot_kws={
-            "fontsize": config_figure["size"]["usual_fontsize"],
+            "fontsize": usual_fs,
             "fontweight": "bold"    # Bold annotations
         },
-        cbar_kws={"shrink": 0.8}    # Colorbar size reduction
+        cbar_kws={"shrink": 0.8},   # Colorbar size reduction
+        xticklabels=True,           # Label every column, centered on its cell
+        yticklabels=True            # Label every row, centered on its cell
     )
 
-    # Ensure ticks are centered
-    ax.set_xticks(np.arange(len(cols)) + 0.5)
-    ax.set_yticks(np.arange(len(rows)) + 0.5)
-    ax.set_xticklabels(
-        cols,
+    # Style the tick labels seaborn has already placed
+    plt.setp(
+        ax.get_xticklabels(),
         rotation=30,
-        fontsize=config_figure["size"]["usual_fontsize"],
+        fontsize=usual_fs,
         ha='right'
     )
-    ax.set_yticklabels(
-        rows,
+    plt.setp(
+        ax.get_yticklabels(),
         rotation=0,
-        fontsize=config_figure["size"]["usual_fontsize"]
+        fontsize=usual_fs
     )
 
     ax.set_xlabel(
         legends["x"],
-        fontsize=config_figure["size"]["axis_fontsize"],
+        fontsize=axis_fs,
         fontweight='bold'
     )
     ax.set_ylabel(
         legends["y"],
-        fontsize=config_figure["size"]["axis_fontsize"],
+        fontsize=axis_fs,
         fontweight='bold'
     )
 
     # Remove minor ticks
     ax.tick_params(which='minor', length=0)
 
-    # Set tick parameters
-    ax.tick_params(axis="x", labelrotation=30)
-    ax.tick_params(axis="y", labelrotation=0)
-
     # Save the figure
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, format='pdf', bbox_inches='tight')
+    _save_figure(save_path, pdf_pages, raster_preview, fig=fig)
 
     print(f"Heatmap saved to {save_path}")
+
+
+
+def batch_render(
+    render_calls: list[tuple],
+    pdf_path: str | None = None
+) -> None:
+    """
+    Render a batch of figures given as (template_function, kwargs) pairs.
+
+    Templates draw on pooled figures that are cleared between renders, so a
+    batch reuses one Figure per figure size. With `pdf_path`, every figure is
+    appended as a page of that single PDF instead of its own `save_path`.
+    """
+    if pdf_path is None:
+        for fn, kwargs in render_calls:
+            fn(**kwargs)
+        return
+
+    _ensure_dir(pdf_path)
+    with PdfPages(pdf_path) as pdf_pages:
+        for fn, kwargs in render_calls:
+            fn(**kwargs, pdf_pages=pdf_pages)
@@ -6,12 +6,39 @@ Utilities for file reading and writing operations.
 
 import os
 import pandas as pd
+from pandas.io.parsers import TextFileReader
 import json
+from functools import lru_cache
+from typing import Callable, overload
 from num2words import num2words
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # errors subclass json.JSONDecodeError
+except ImportError:  # orjson is optional; fall back to the standard library
+    _json_loads = json.loads
+
+Usecols = list[str] | Callable[[str], bool] | None
+
+@overload
+def read_csv(
+    file_dir: str, file_name: str, encoding: str = ...,
+    chunksize: None = ..., usecols: Usecols = ..., dtype=...
+) -> pd.DataFrame: ...
+@overload
 def read_csv(
-    file_dir: str, file_name: str, encoding='utf-8'
-) -> pd.DataFrame:
+    file_dir: str, file_name: str, encoding: str = ...,
+    *, chunksize: int, usecols: Usecols = ..., dtype=...
+) -> TextFileReader: ...
+def read_csv(
+    file_dir: str, file_name: str, encoding='utf-8',
+    chunksize: int | None = None, usecols: Usecols = None, dtype=None
+) -> pd.DataFrame | TextFileReader:
+    """
+    Read a CSV file. `usecols` and `dtype` restrict what is parsed; with
+    `chunksize` a TextFileReader yielding DataFrames of that many rows is
+    returned instead of the whole file.
+    """
     # Build the full directory path
     file_path = os.path.join(file_dir, file_name)
     
@@ -21,13 +48,25 @@ def read_csv(
     
     # Read the CSV file
     try:
-        df = pd.read_csv(file_path, encoding=encoding)
+        df = pd.read_csv(
+            file_path, encoding=encoding, chunksize=chunksize, usecols=usecols, dtype=dtype
+        )
         return df
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         exit(-1)
 
+@lru_cache(maxsize=32)
+def _load_config(config_path: str, mtime: float) -> dict:
+    # Keyed on the modification time so an edited config is parsed again
+    with open(config_path, "rb") as f:
+        return _json_loads(f.read())
+
 def read_config_json(file_name: str) -> dict:
+    """
+    Read a JSON config from the config folder. Parsed configs are cached and
+    shared between callers, so treat the returned dict as read-only.
+    """
     # Get the current directory of this script
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -43,8 +82,7 @@ def read_config_json(file_name: str) -> dict:
     
     # Read and parse the JSON config file
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = _load_config(config_path, os.path.getmtime(config_path))
         return config
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON file: {e}")
@@ -73,13 +111,14 @@ def tex_file_generation(
     """
     os.makedirs(file_dir, exist_ok=True)
     file_path = os.path.join(file_dir, file_name)
-    text_lines = [str(l).rstrip("\r\n") for l in lines]
-    text = "\n".join(text_lines)
+    text = "\n".join(str(l).rstrip("\r\n") for l in lines)
     if ensure_trailing_newline and not text.endswith("\n"):
         text += "\n"
-    with open(file_path, "w", encoding=encoding, newline="\n") as f:
-        f.write(text)
+    # Encode once and write the bytes as is: no newline translation, always "\n"
+    with open(file_path, "wb") as f:
+        f.write(text.encode(encoding))
 
+@lru_cache(maxsize=4096)
 def number2camelform(number: int, lang="en") -> str:
     # Transfer the number to corresponding English word
     word = num2words(int(number), lang=lang)
@@ -90,4 +129,4 @@ def number2camelform(number: int, lang="en") -> str:
 
 def paperids2citation(ids: list) -> str:
     temp_list = [f"\\Paper{number2camelform(int(idx))}" for idx in ids]
-    return f"\\cite{{{' ,'.join(temp_list)}}}"
\ No newline at end of file
+    return f"\\cite{{{', '.join(temp_list)}}}"
\ No newline at end of file
@@ -7,88 +7,74 @@ import pandas as pd
 import bibtexparser
 from bibtexparser.bibdatabase import BibDatabase
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import os 
-import unicodedata
+import re
 
 from typing import Optional
 
+# The Rust-backed calamine reader is optional and only known to pandas >= 2.2;
+# otherwise let pandas pick (xlrd for .xls)
+excel_engine = None
+if tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2):
+    try:
+        import python_calamine  # noqa: F401
+        excel_engine = "calamine"
+    except ImportError:
+        pass
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.dirname(current_dir)
 input_dir = os.path.join(root_dir, "doc", "literature_pool", "raw")
 output_dir = os.path.join(root_dir, "doc", "literature_pool", "merged")
 
+# Web of Science export columns used to build the BibTeX entries
+xls_columns = {
+    "Document Type", "UT (Unique ID)", "Authors", "Article Title", "Publication Year", "Abstract",
+    "Source Title", "Volume", "Issue", "Start Page", "End Page", "DOI"
+}
+
+# Title normalization: unify curly quotes, then drop punctuation (anything
+# that is neither alphanumeric nor whitespace; \w also matches '_')
+quote_table = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"'})
+punctuation_re = re.compile(r'[^\w\s]|_')
+
 def xls2bib(file_name: str, sheet_name: Optional[str] = None):
     """
     Convert an Excel file to a BibTeX file, mapping Document Type to BibTeX entry types.
     """
-    def row_to_bibtex(row):
-        raw_type = str(row.get('Document Type', '')).strip()
-        entrytype = doc_type_mapping.get(raw_type, 'misc')  # default: misc
-
-        entry = {}
-        entry['ENTRYTYPE'] = entrytype
-        entry['ID'] = str(row.get('UT (Unique ID)', f"ID{row.name}"))
-        entry['author'] = row['Authors'].replace('; ', ' and ') if isinstance(row.get('Authors'), str) else ''
-        entry['title'] = row['Article Title'] if isinstance(row.get('Article Title'), str) else ''
-        entry['year'] = str(int(row['Publication Year'])) if pd.notnull(row.get('Publication Year')) else ''
-        entry['abstract'] = row['Abstract'] if isinstance(row.get('Abstract'), str) else ''
-
-        # Set publication source fields based on entry type (more comprehensive rules)
-        source = row.get('Source Title')
-        if isinstance(source, str) and source.strip():
-            src = source.strip()
-            # Prepare entry type for comparison (lowercase)
-            et = entrytype.lower()
-
-            # Entry types that should use booktitle
-            booktitle_types = {'inproceedings', 'conference', 'incollection', 'inbook'}
-
-            if et in booktitle_types:
-                # Conference papers / book chapters: use Source Title as booktitle
-                entry['booktitle'] = src
-            elif et == 'article':
-                # Journal articles
-                entry['journal'] = src
-            elif et == 'proceedings':
-                # Entire proceedings volume: put Source Title into title if not already present
-                # Preserve the original title (Article Title) if it exists
-                if not entry.get('title'):
-                    entry['title'] = src
-                else:
-                    # If title already exists, store proceedings name in note (or leave out)
-                    entry.setdefault('note', src)
-            elif et == 'book':
-                # Whole book: Source Title is usually the book title
-                if not entry.get('title'):
-                    entry['title'] = src
-                else:
-                    # If title already exists, Source Title may be publisher or missing info
-                    entry.setdefault('publisher', src)
-            else:
-                # Other types (techreport, phdthesis, misc, etc.)
-                # Default: put Source Title into note (can be adjusted if needed)
-                entry.setdefault('note', src)
+    def column(name: str) -> pd.Series:
+        # Missing columns behave like a column of empty cells
+        if name in df.columns:
+            return df[name]
+        return pd.Series(None, index=df.index, dtype=object)
 
-        # Other optional fields
-        if pd.notnull(row.get('Volume')):
-            entry['volume'] = str(int(row['Volume']))
-        if pd.notnull(row.get('Issue')):
-            entry['number'] = str(int(row['Issue']))
-        if pd.notnull(row.get('Start Page')) and pd.notnull(row.get('End Page')):
-            entry['pages'] = f"{int(row['Start Page'])}-{int(row['End Page'])}"
-        if isinstance(row.get('DOI'), str):
-            entry['doi'] = row['DOI']
+    def masked(values: pd.Series, mask: pd.Series) -> pd.Series:
+        # Keep values where mask holds; NaN marks a field left out of the entry
+        return values.where(mask)
+
+    def text_column(name: str) -> pd.Series:
+        # String cells as they are, anything else (NaN, numbers) as ''
+        values = column(name)
+        return values.where(values.map(lambda v: isinstance(v, str)), '')
 
-        return entry
+    def int_column(name: str) -> pd.Series:
+        # Numeric cells rendered as integers, NaN for empty cells
+        values = column(name)
+        present = values.notna()
+        return values[present].astype('int64').astype(str).reindex(df.index)
 
 
     # Read Excel file
     input_path =  os.path.join(input_dir, f"{file_name}.xls")
-    excel_file = pd.ExcelFile(input_path)
-    if sheet_name is None:
-        sheet_name = excel_file.sheet_names[0]  # type: ignore
-    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    # Open the workbook once (sheet 0 is the first sheet) and parse only the needed columns
+    df = pd.read_excel(
+        input_path,
+        sheet_name=0 if sheet_name is None else sheet_name,
+        engine=excel_engine,
+        usecols=lambda header: header in xls_columns
+    )
 
     # Map Document Type to BibTeX entry types
     doc_type_mapping = {
@@ -102,10 +88,57 @@ def xls2bib(file_name: str, sheet_name: Optional[str] = None):
         'Note': 'misc'
     }
 
-    # Build BibTeX database
+    # Build every field as a whole column instead of row by row
+    entrytype = column('Document Type').astype(str).str.strip().map(doc_type_mapping).fillna('misc')  # default: misc
+    if 'UT (Unique ID)' in df.columns:
+        entry_id = df['UT (Unique ID)'].astype(str)
+    else:
+        entry_id = 'ID' + pd.Series(df.index.astype(str), index=df.index)
+    title = text_column('Article Title')
+    pages_present = column('Start Page').notna() & column('End Page').notna()
+
+    # Set publication source fields based on entry type (more comprehensive rules)
+    source = column('Source Title')
+    has_source = source.map(lambda v: isinstance(v, str) and bool(v.strip()))
+    source = source.where(has_source, '').str.strip()
+    title_empty = title == ''
+    # Entry types that should use booktitle
+    booktitle_types = {'inproceedings', 'conference', 'incollection', 'inbook'}
+    # Entire proceedings volume or whole book: Source Title becomes the title if there is none
+    takes_title = has_source & entrytype.isin(['proceedings', 'book']) & title_empty
+    # Other types (techreport, phdthesis, misc, etc.) put Source Title into note,
+    # as do proceedings volumes that already have a title
+    to_note = has_source & (
+        ((entrytype == 'proceedings') & ~title_empty)
+        | ~entrytype.isin(booktitle_types | {'article', 'proceedings', 'book'})
+    )
+
+    fields = pd.DataFrame({
+        'ENTRYTYPE': entrytype,
+        'ID': entry_id,
+        'author': text_column('Authors').str.replace('; ', ' and ', regex=False),
+        'title': title.where(~takes_title, source),
+        'year': int_column('Publication Year').fillna(''),
+        'abstract': text_column('Abstract'),
+        'booktitle': masked(source, has_source & entrytype.isin(booktitle_types)),
+        'journal': masked(source, has_source & (entrytype == 'article')),
+        'note': masked(source, to_note),
+        # Whole book that already has a title: Source Title is usually the publisher
+        'publisher': masked(source, has_source & (entrytype == 'book') & ~title_empty),
+        # Other optional fields
+        'volume': int_column('Volume'),
+        'number': int_column('Issue'),
+        'pages': masked(int_column('Start Page') + '-' + int_column('End Page'), pages_present),
+        'doi': masked(column('DOI'), column('DOI').map(lambda v: isinstance(v, str))),
+    })
+
+    # Build BibTeX database; every present field is a string, so anything
+    # else (NaN) is a field the entry does not have
     database = BibDatabase()
-    for _, row in df.iterrows():  # type: ignore
-        database.entries.append(row_to_bibtex(row))
+    database.entries = [
+        {key: value for key, value in record.items() if isinstance(value, str)}
+        for record in fields.to_dict(orient='records')
+    ]
 
     output_path = os.path.join(input_dir, f"{file_name}.bib")
     # Write to file
@@ -115,6 +148,12 @@ def xls2bib(file_name: str, sheet_name: Optional[str] = None):
     print(f"✅ BibTeX file generated: {output_path}")
 
 
+def _load_bib_entries(bib_path: str) -> list[dict]:
+    """Parse one BibTeX file and return its entries (runs in a worker process)."""
+    with open(bib_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return bibtexparser.load(f).entries
+
+
 def merge_bib(bib_file_list: list[str], output_name: str):
     """
     Merge multiple BibTeX files, deduplicate entries by title,
@@ -149,37 +188,32 @@ def merge_bib(bib_file_list: list[str], output_name: str):
                     merged[k] = v
         return merged
 
-    def normalize_title(title: str) -> str:
-        """Normalize title format: remove special quotes, spaces, and case differences."""
-        if not title:
-            return ''
-        t = title.lower().strip()
-        t = unicodedata.normalize('NFKC', t)
-        t = t.replace("’", "'").replace("‘", "'").replace("“", '"').replace("”", '"')
-        return ''.join(ch for ch in t if ch.isalnum() or ch.isspace())  # remove punctuation
+    def normalize_titles(titles: list[str]) -> list[str]:
+        """Normalize title format of all titles at once: remove special quotes, spaces, and case differences."""
+        t = pd.Series(titles, dtype=object).str.lower().str.strip()
+        t = t.str.normalize('NFKC').str.translate(quote_table)
+        return t.str.replace(punctuation_re, '', regex=True).tolist()  # remove punctuation
 
     title_dict = {}
     no_title_entries = []
 
-    for bib_file in bib_file_list:
-        bib_path = os.path.join(input_dir, bib_file)
-        with open(bib_path, 'r', encoding='utf-8', errors='ignore') as f:
-            bib_db = bibtexparser.load(f)
+    # Parsing dominates the run time, so parse the files in parallel;
+    # map() keeps the input order, so the merge below stays deterministic
+    bib_paths = [os.path.join(input_dir, bib_file) for bib_file in bib_file_list]
+    with ProcessPoolExecutor(max_workers=max(1, min(len(bib_paths), os.cpu_count() or 1))) as executor:
+        entries = [entry for file_entries in executor.map(_load_bib_entries, bib_paths) for entry in file_entries]
 
-        for entry in bib_db.entries:
-            title_raw = entry.get('title', '').strip()
-            norm_title = normalize_title(title_raw)
-            if not norm_title:
-                no_title_entries.append(entry)
-                continue
+    norm_titles = normalize_titles([entry.get('title', '').strip() for entry in entries])
+    for entry, norm_title in zip(entries, norm_titles):
+        if not norm_title:
+            no_title_entries.append(entry)
+            continue
 
-            if norm_title in title_dict:
-                title_dict[norm_title] = merge_entries(title_dict[norm_title], entry)
-            else:
-                title_dict[norm_title] = entry
+        existing = title_dict.get(norm_title)
+        title_dict[norm_title] = entry if existing is None else merge_entries(existing, entry)
 
     merged_database = BibDatabase()
-    merged_database.entries = list(title_dict.values()) + no_title_entries
+    merged_database.entries = [*title_dict.values(), *no_title_entries]
 
     # Write output file
     output_path = os.path.join(output_dir, f"{output_name}.bib")
@@ -199,28 +233,28 @@ def bib2csv(output_name: str):
     with open(output_path, 'r', encoding='utf-8') as f:
         bib_database = bibtexparser.load(f)
 
-    rows = []
-    for entry in bib_database.entries:
-        # Manually reconstruct BibTeX string
-        bibtex_str = f"@{entry.get('ENTRYTYPE', 'misc')}{{{entry.get('ID', '')},\n"
-        for key, value in entry.items():
-            if key not in ['ENTRYTYPE', 'ID']:
-                bibtex_str += f"  {key} = {{{value}}},\n"
-        bibtex_str += "}"
-
-        rows.append({
-            'Title': entry.get('title', ''),
-            'Author': entry.get('author', ''),
-            'Year': entry.get('year', ''),
-            'DOI': entry.get('doi', ''),
-            'Venue': entry.get('journal', entry.get('booktitle', '')),
-            'Link': entry.get('url', ''),
-            'Publisher': entry.get('publisher', ''),
-            'Abstract': entry.get('abstract', ''),
-            'BibTeX': bibtex_str  # newly added column
-        })
-
-    df = pd.DataFrame(rows)
+    def entry_to_bibtex_str(entry: dict) -> str:
+        # Manually reconstruct BibTeX string (joined once rather than grown with +=)
+        parts = [f"@{entry.get('ENTRYTYPE', 'misc')}{{{entry.get('ID', '')},\n"]
+        parts.extend(
+            f"  {key} = {{{value}}},\n" for key, value in entry.items() if key not in ('ENTRYTYPE', 'ID')
+        )
+        parts.append("}")
+        return "".join(parts)
+
+    # Build the columns directly rather than one dict per row
+    entries = bib_database.entries
+    df = pd.DataFrame({
+        'Title': [entry.get('title', '') for entry in entries],
+        'Author': [entry.get('author', '') for entry in entries],
+        'Year': [entry.get('year', '') for entry in entries],
+        'DOI': [entry.get('doi', '') for entry in entries],
+        'Venue': [entry.get('journal', entry.get('booktitle', '')) for entry in entries],
+        'Link': [entry.get('url', '') for entry in entries],
+        'Publisher': [entry.get('publisher', '') for entry in entries],
+        'Abstract': [entry.get('abstract', '') for entry in entries],
+        'BibTeX': [entry_to_bibtex_str(entry) for entry in entries]  # newly added column
+    })
     csv_file_path = os.path.join(output_dir, f"{output_name}.csv")
     df.to_csv(csv_file_path, index=False, encoding='utf-8-sig')
 
@@ -3,8 +3,23 @@ Docstring for src.table_templates
 Templates for various types of tables used in data presentation.
 """
 
-import os, re
-
+import re
+from functools import lru_cache
+
+from ._paths import _ensure_dir
+
+# Column definition parsing, compiled once for all tables
+# Separators: spaces and vertical bars
+_SEPARATOR_TABLE = str.maketrans("", "", " |")
+# Modifiers like >{...} and <{...}; non-greedy {...}, allowing repeated braces like >{{...}}
+_MODIFIER_RE = re.compile(r'[<>]\{+.*?\}+', flags=re.DOTALL)
+# Columns:
+#  - parameterized columns: p{...}, m{...}, b{...}, X{...}
+#    (support one-or-more opening braces and corresponding closing braces)
+#  - simple columns: c, l, r (single letters)
+_COLUMN_RE = re.compile(r'(?:[pmbX]\{+.*?\}+|[clr])', flags=re.DOTALL)
+
+@lru_cache(maxsize=128)
 def count_latex_columns(col_def: str) -> int:
     """
     Count columns in a LaTeX tabular column definition string.
@@ -24,21 +39,20 @@ def count_latex_columns(col_def: str) -> int:
     s = col_def.strip()
 
     # remove spaces and vertical bars (separators)
-    s = s.replace(" ", "").replace("|", "")
+    s = s.translate(_SEPARATOR_TABLE)
 
-    # remove modifiers like >{...} and <{...} because they are not columns
-    # use non-greedy match for {...}, allow nested repeated braces like >{{...}}
-    s = re.sub(r'[<>]\{+.*?\}+', '', s, flags=re.DOTALL)
+    # without braces there are no modifiers or parameterized columns:
+    # only the single-letter columns count
+    if "{" not in s:
+        return sum(map(s.count, "clr"))
 
-    # pattern to match:
-    #  - parameterized columns: p{...}, m{...}, b{...}, X{...}
-    #    (support one-or-more opening braces and corresponding closing braces)
-    #  - simple columns: c, l, r (single letters)
-    pattern = re.compile(r'(?:[pmbX]\{+.*?\}+|[clr])', flags=re.DOTALL)
+    # remove modifiers like >{...} and <{...} because they are not columns
+    s = _MODIFIER_RE.sub('', s)
 
-    matches = pattern.findall(s)
+    matches = _COLUMN_RE.findall(s)
     return len(matches)
 
+@lru_cache(maxsize=256)
 def centering_header(header):
     # if last_one:
     #     return f"\\multicolumn{{1}}{{c}}{{\\textbf{{{header}}}}}"
@@ -46,6 +60,11 @@ def centering_header(header):
     #     return f"\\multicolumn{{1}}{{c|}}{{\\textbf{{{header}}}}}"
     return f"\\multicolumn{{1}}{{c}}{{\\textbf{{{header}}}}}"
 
+@lru_cache(maxsize=64)
+def cmidrule_headers(n_cols: int) -> str:
+    # One \cmidrule per header column; tables in a run mostly share column counts
+    return " ".join([f"\\cmidrule(lr){{{idx+1}-{idx+1}}}" for idx in range(n_cols)])
+
 def vertical_tables(
     data: dict,
     headers: list[str],
@@ -90,42 +109,43 @@ def vertical_tables(
     """
     cent_headers = [centering_header(header) for header in headers]
     headers_str = " & ".join(map(str, cent_headers))
-    cmidrule_header = " ".join([f"\\cmidrule(lr){{{idx+1}-{idx+1}}}" for idx in range(len(headers))])
+    cmidrule_header = cmidrule_headers(len(headers))
 
-    data_content = ""
- 
+    # Fragments are joined once at the end instead of growing a string
+    parts = []
+    last_key = next(reversed(data), None)
 
     for line_name, line_data in data.items():
         # Case 1: inner value is a dict
         if isinstance(line_data, dict):
-            values = list(line_data.values())
-            data_content += f"{line_name} & " + " & ".join(map(str, values)) + " \\\\ \n    "
-            if if_midrule_each_line == True and line_name != list(data.keys())[-1]:
-                # data_content += f"\\cmidrule(lr){{1-{n_cols}}} \n    "
-                data_content += f"{cmidrule_header} \n"
+            values = line_data.values()
+            parts.append(f"{line_name} & " + " & ".join(map(str, values)) + " \\\\ \n    ")
+            if if_midrule_each_line == True and line_name != last_key:
+                # parts.append(f"\\cmidrule(lr){{1-{n_cols}}} \n    ")
+                parts.append(f"{cmidrule_header} \n")
         # Case 2: inner value is a list of dicts
         elif isinstance(line_data, list):
             for idx, sub_dict in enumerate(line_data):
-                values = list(sub_dict.values())
+                values = sub_dict.values()
                 if idx == 0:
-                    data_content += (
+                    parts.append(
                         f"{line_name} & "
                         + " & ".join(map(str, values))
                         + " \\\\ \n    "
                     )
                 else:
-                    if line_name != list(data.keys())[-1]:
-                        data_content += " & " + " & ".join(map(str, values)) + " \\\\ \n    "
+                    if line_name != last_key:
+                        parts.append(" & " + " & ".join(map(str, values)) + " \\\\ \n    ")
                     else:
-                        data_content += " & " + " & ".join(map(str, values)) + " \\\\    "
-                    if if_midrule_each_line == True and line_name != list(data.keys())[-1]:
-                        # data_content += f"\\cmidrule(lr){{1-{n_cols}}} \n    "
-                        data_content += f"{cmidrule_header} \n        "
+                        parts.append(" & " + " & ".join(map(str, values)) + " \\\\    ")
+                    if if_midrule_each_line == True and line_name != last_key:
+                        # parts.append(f"\\cmidrule(lr){{1-{n_cols}}} \n    ")
+                        parts.append(f"{cmidrule_header} \n        ")
                         
             # Add cmidrule across all columns if requested, but not for the last block
-            if if_cmidrule and line_name != list(data.keys())[-1]:
-                # data_content += f"\\cmidrule(lr){{1-{n_cols}}} \n    "
-                data_content += f"{cmidrule_header} \n    "
+            if if_cmidrule and line_name != last_key:
+                # parts.append(f"\\cmidrule(lr){{1-{n_cols}}} \n    ")
+                parts.append(f"{cmidrule_header} \n    ")
         else:
             raise ValueError(f"Unsupported data type for key '{line_name}': {type(line_data)}")
 
@@ -137,7 +157,7 @@ def vertical_tables(
         addition_line = ""
 
     # Remove trailing spaces and newlines
-    data_content = data_content.rstrip()
+    data_content = "".join(parts).rstrip()
 
     latex_code = f"""
 \\begin{{tabular}}{{{tab_space}}}
@@ -149,7 +169,7 @@ def vertical_tables(
 \\end{{tabular}}
         """
 
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    _ensure_dir(save_path)
     with open(save_path, "w", encoding="utf-8") as f:
         f.write(latex_code)
 
@@ -168,7 +188,8 @@ def vertical_grouped_table(
     - Each top-level key is a separate row (like a group header)
     - Each value dict (or list of dicts) is displayed row-wise under the key
     """
-    content_lines = ""
+    # Fragments are joined once at the end instead of growing a string
+    parts = []
  
     num_columns = count_latex_columns(tab_space)
    
@@ -179,20 +200,22 @@ def vertical_grouped_table(
         val_list = data[key]
 
         # Top-level key as group header
-        content_lines += f"""
+        parts.append(f"""
     \\multicolumn{{{num_columns}}}{{l}}{{\\textbf{{{key}:}}}} \\\\
-    """
+    """)
 
         # Sub-item content
         if isinstance(val_list, list):
             for sub_dict in val_list:
-                content_lines += " & ".join(str(v) for v in sub_dict.values()) + " \\\\\n    "
+                parts.append(" & ".join(map(str, sub_dict.values())) + " \\\\\n    ")
         elif isinstance(val_list, dict):
-            content_lines += " & ".join(str(v) for v in val_list.values()) + " \\\\\n    "
+            parts.append(" & ".join(map(str, val_list.values())) + " \\\\\n    ")
 
         # Add separator line if not the last key, or if it is the last key and addition_line is provided
         if idx < n_keys - 1 or idx == n_keys - 1 and addition_line is not None:
-            content_lines += f"\\cmidrule(lr){{1-{num_columns}}}\n"
+            parts.append(f"\\cmidrule(lr){{1-{num_columns}}}\n")
+
+    content_lines = "".join(parts)
 
     # Optional additional line
     if addition_line is None:
@@ -206,7 +229,7 @@ def vertical_grouped_table(
     \\bottomrule[1pt]
 \\end{{tabular}}
 """
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    _ensure_dir(save_path)
     with open(save_path, "w", encoding="utf-8") as f:
         f.write(latex_code)
     
@@ -219,10 +242,7 @@ def two_dimensional_table(
     # Rows and columns (sorted by dictionary keys; can be changed to list(...) to preserve original order)
     rows = sorted(data_dict.keys())
 
-    col_set = set()
-    for r in rows:
-        col_set.update(data_dict[r].keys())
-    cols = sorted(col_set)
+    cols = sorted(set().union(*data_dict.values()))
 
     # Column alignment: first column c, remaining columns c
     tab_space = "c|" + "c" * len(cols)
@@ -237,10 +257,9 @@ def two_dimensional_table(
     # Data content
     lines = []
     for r in rows:
-        row_vals = [r]  # First column is the row name
-        for c in cols:
-            row_vals.append(data_dict[r].get(c, ""))
-        lines.append(" & ".join(row_vals) + "\\\\")
+        row_dict = data_dict[r]
+        # First column is the row name; missing cells are left empty
+        lines.append(" & ".join([r, *(row_dict.get(c, "") for c in cols)]) + "\\\\")
     data_content = "\n    ".join(lines)
 
     # Add an extra line here if needed
@@ -258,7 +277,7 @@ def two_dimensional_table(
 \\end{{tabular}}
     """
 
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    _ensure_dir(save_path)
     with open(save_path, "w", encoding="utf-8") as f:
         f.write(latex_code)
     